@@ -1,13 +1,22 @@
-import pathlib, sys
-bad=[]
-for p in pathlib.Path('.').rglob('*.py'):
+import concurrent.futures, mmap, os, pathlib, sys
+
+def _check(p):
+    # returns p if it contains a NUL byte, else None
     try:
-        b = p.read_bytes()
+        with open(p, 'rb') as f:
+            sz = os.fstat(f.fileno()).st_size
+            if sz == 0:
+                return None  # mmap cannot map empty files
+            with mmap.mmap(f.fileno(), sz, access=mmap.ACCESS_READ) as mm:
+                return p if mm.find(b'\x00') != -1 else None
     except Exception as e:
         print("READ ERROR", p, e)
-        continue
-    if b'\x00' in b:
-        bad.append(p)
+        return None
+
+# I/O bound: threads overlap the open/mmap syscalls (the GIL is released during them)
+paths = list(pathlib.Path('.').rglob('*.py'))
+with concurrent.futures.ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as ex:
+    bad = [p for p in ex.map(_check, paths) if p]
 if bad:
     print("NUL bytes found in:")
     for p in bad: print(" -", p)
@@ -1,12 +1,30 @@
 # core.py
-from pydantic import BaseModel, Field
-import numpy as np
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
 
-class Inputs(BaseModel):
+_DAYS_PER_YEAR = 365.0
+
+# Lookup tables for the select-style inputs; labels are mapped to indices once in Inputs.__post_init__
+_OUTAGE_DUR = ("<30m", "30-60m", "1-2h", ">2h")
+_OUTAGE_VALS = (0.5, 1.0, 2.0, 3.0)             # outage duration -> h
+_TOD = ("Morning", "Afternoon", "Evening")
+_TOD_VALS = (1.0, 1.2, 1.5)                     # outage time multiplier
+_DUST_LEVELS = ("Low", "Medium", "Heavy")
+_DUST_VALS = (0.00, 0.05, 0.10)                 # dust margin
+_SEV_FREQS = ("Rare", "Seasonal", "Often")
+_SEV_FREQ_VALS = (0.5, 1.0, 1.5, 0.0)           # severe event frequency; last slot = no severe event
+_SEV_NONE_IDX = 3
+
+def _label_idx(labels: tuple, value: str, default: int) -> int:
+    # unknown labels fall back to the default entry
+    return labels.index(value) if value in labels else default
+
+@dataclass(slots=True, frozen=True)   # frozen -> hashable, usable as plan() cache key
+class Inputs:
     # Demand
-    E_bill_month_kwh: float | None = Field(None, description="Monthly billed energy (kWh)")
-    N_day: int = Field(0, ge=0, description="Daytime residents")
-    N_night: int = Field(0, ge=0, description="Overnight residents")
+    E_bill_month_kwh: float | None = None  # monthly billed energy (kWh)
+    N_day: int = 0                       # daytime residents
+    N_night: int = 0                     # overnight residents
     growth_pct: float = 0.0  # %
 
     # Water / pump
@@ -55,6 +73,27 @@ class Inputs(BaseModel):
     # Safety bounds
     growth_cap: float = 2.0              # max growth multiplier
 
+    # Derived lookup indices (set in __post_init__)
+    _outage_idx: int = field(init=False, repr=False, compare=False)
+    _tod_idx: int = field(init=False, repr=False, compare=False)
+    _dust_idx: int = field(init=False, repr=False, compare=False)
+    _sev_freq_idx: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.N_day < 0 or self.N_night < 0:
+            raise ValueError("N_day and N_night must be >= 0")
+        # frozen dataclass -> bypass __setattr__
+        object.__setattr__(self, "_outage_idx", _label_idx(_OUTAGE_DUR, self.outage_duration, 1))
+        object.__setattr__(self, "_tod_idx", _label_idx(_TOD, self.outage_time, 0))
+        object.__setattr__(self, "_dust_idx", _label_idx(_DUST_LEVELS, self.dust_level, 0))
+        object.__setattr__(self, "_sev_freq_idx",
+                           _SEV_NONE_IDX if self.severe_event == "None" else _label_idx(_SEV_FREQS, self.severe_freq, 1))
+
+    def model_dump(self) -> dict:
+        return {name: getattr(self, name) for name in _INPUT_FIELDS}
+
+_INPUT_FIELDS = tuple(f.name for f in fields(Inputs) if f.init)   # user-facing fields, in declaration order
+
 def daily_site_energy_kwh(i: Inputs) -> float:
     if i.E_bill_month_kwh and i.E_bill_month_kwh > 0:
         return i.E_bill_month_kwh / 30.0
@@ -62,6 +101,8 @@ def daily_site_energy_kwh(i: Inputs) -> float:
     return 2.8 * i.N_day + 1.4 * i.N_night
 
 def pump_energy_kwh_day(i: Inputs) -> float:
+    if not i.W_month_liters:
+        return 0.0  # water section left empty
     # hydraulic if head known, else proxy specific energy (kWh/m3)
     if i.head_m is not None:
         rho, g = 1000.0, 9.81
@@ -81,14 +122,10 @@ def growth_multiplier(i: Inputs) -> float:
 
 def critical_fraction(i: Inputs) -> float:
     base = 0.30 + (0.05 if i.essentials_listed else 0.0)
-    return float(np.clip(base, 0.20, 0.40))
+    return 0.20 if base < 0.20 else 0.40 if base > 0.40 else base
 
 def autonomy_hours(i: Inputs) -> float:
-    base_map = {"<30m": 0.5, "30-60m": 1.0, "1-2h": 2.0, ">2h": 3.0}
-    t_mult = {"Morning": 1.0, "Afternoon": 1.2, "Evening": 1.5}
-    T_base = base_map.get(i.outage_duration, 1.0)
-    kappa = t_mult.get(i.outage_time, 1.0)
-    T = max(2.0, T_base * kappa)
+    T = max(2.0, _OUTAGE_VALS[i._outage_idx] * _TOD_VALS[i._tod_idx])
     # optional water-priority bump
     bump = i.T_water_extra_h_max * max(0.0, (i.S_water - 7) / 2.0)
     return T + bump
@@ -97,14 +134,11 @@ def performance_ratio_eff(i: Inputs) -> float:
     return i.PR_base * (1.0 - i.shading_pct / 100.0)
 
 def dust_margin(i: Inputs) -> float:
-    return {"Low": 0.00, "Medium": 0.05, "Heavy": 0.10}.get(i.dust_level, 0.0)
+    return _DUST_VALS[i._dust_idx]
 
 def severe_margin(i: Inputs) -> float:
-    if i.severe_event == "None":
-        return 0.0
     base = 0.03
-    freq = {"Rare": 0.5, "Seasonal": 1.0, "Often": 1.5}.get(i.severe_freq, 1.0)
-    return base * freq
+    return base * _SEV_FREQ_VALS[i._sev_freq_idx]   # 0.0 when severe_event == "None"
 
 def priority_margins(i: Inputs) -> float:
     m = 0.0
@@ -116,41 +150,176 @@ def total_margin(i: Inputs) -> float:
     M = dust_margin(i) + severe_margin(i) + priority_margins(i)
     return min(M, 0.20)
 
-def plan(i: Inputs) -> dict:
-    # Demand
-    E_site = daily_site_energy_kwh(i)
-    E_pump = pump_energy_kwh_day(i) * water_priority_factor(i)
-    G = growth_multiplier(i)
+@dataclass(slots=True, frozen=True)
+class PlanResult:
+    E_site: float
+    E_pump: float
+    G: float
+    E_daily: float
+    fcrit: float
+    T_aut: float
+    E_crit: float
+    E_aut: float
+    E_need: float
+    E_bat: float
+    PR_eff: float
+    kWp_raw: float
+    kWp_cap: float
+    kWp: float
+    P_inv: float
+    E_pv_yr: float
+    E_load_yr: float
+    E_matched: float
+    tCO2_yr: float
+    credits_yr: float
+    value_carbon_yr: float
+    h_pump: float
+
+    def as_dict(self) -> dict:
+        # built only at serialization time; shallow, since every field is a float
+        return {name: getattr(self, name) for name in self.__slots__}
+
+@lru_cache(maxsize=128)
+def plan(i: Inputs) -> PlanResult:
+    # bind the fields used below once (LOAD_FAST instead of repeated attribute lookups)
+    PSH = i.PSH; DoD = i.DoD; eta_sys = i.eta_sys; DC_AC = i.DC_AC
+    PD = i.PD_kwp_per_m2; A_roof = i.A_roof_m2; A_ground = i.A_ground_m2
+    EF = i.EF_grid if i.grid_yes else i.EF_diesel
+    p_CO2 = i.p_CO2; P_pump_kw = i.P_pump_kw
+
+    # Demand (helpers inlined; the standalone versions above remain the reference)
+    E_bill = i.E_bill_month_kwh
+    E_site = E_bill / 30.0 if E_bill and E_bill > 0 else 2.8 * i.N_day + 1.4 * i.N_night
+    S_water = i.S_water
+    E_pump = pump_energy_kwh_day(i)
+    if E_pump:
+        E_pump *= 1.0 + i.beta_water * max(0.0, (S_water - 7) / 3.0)
+    G = min(1.0 + i.growth_pct / 100.0, i.growth_cap)
     E_daily = (E_site + E_pump) * G
 
     # Critical and autonomy
-    fcrit = critical_fraction(i)
+    fcrit = 0.30 + (0.05 if i.essentials_listed else 0.0)   # always inside critical_fraction's [0.20, 0.40]
     E_crit = fcrit * E_daily
-    T_aut = autonomy_hours(i)
+    T_aut = (max(2.0, _OUTAGE_VALS[i._outage_idx] * _TOD_VALS[i._tod_idx])
+             + i.T_water_extra_h_max * max(0.0, (S_water - 7) / 2.0))
     E_aut = E_daily * (T_aut / 24.0)
     E_need = max(E_crit, E_aut)
-    E_bat = E_need / (i.DoD * i.eta_sys)
+    E_bat = E_need / (DoD * eta_sys)
 
     # PV size
-    PR_eff = performance_ratio_eff(i)
-    kWp_raw = E_daily / (i.PSH * PR_eff) * (1.0 + total_margin(i))
-    kWp_cap = (i.A_roof_m2 + i.A_ground_m2) * i.PD_kwp_per_m2
+    PR_eff = i.PR_base * (1.0 - i.shading_pct / 100.0)
+    M = (_DUST_VALS[i._dust_idx]
+         + 0.03 * _SEV_FREQ_VALS[i._sev_freq_idx]
+         + ((0.02 if i.S_elec >= 8 else 0.0) + (0.02 if S_water >= 8 else 0.0)))
+    M = M if M < 0.20 else 0.20
+    kWp_raw = E_daily / (PSH * PR_eff) * (1.0 + M)
+    kWp_cap = (A_roof + A_ground) * PD
     kWp = min(kWp_raw, kWp_cap)
-    P_inv = kWp / i.DC_AC
+    P_inv = kWp / DC_AC
 
     # Annuals & carbon
-    E_pv_yr = kWp * i.PSH * PR_eff * 365.0
-    E_load_yr = E_daily * 365.0
+    daily_pv = kWp * PSH * PR_eff
+    E_pv_yr = daily_pv * _DAYS_PER_YEAR
+    E_load_yr = E_daily * _DAYS_PER_YEAR
     E_matched = min(E_pv_yr, E_load_yr)
-    EF = i.EF_grid if i.grid_yes else i.EF_diesel
-    tCO2_yr = E_matched * EF / 1000.0
+    tCO2_yr = E_matched * EF * 1e-3      # kg -> t
     credits_yr = tCO2_yr                 # no buffer
-    value_carbon_yr = credits_yr * i.p_CO2
+    value_carbon_yr = credits_yr * p_CO2
+
+    # Convenience hints
+    h_pump = max(0.5, E_pump / max(P_pump_kw, 0.1))
+
+    return PlanResult(
+        E_site=E_site,
+        E_pump=E_pump,
+        G=G,
+        E_daily=E_daily,
+        fcrit=fcrit,
+        T_aut=T_aut,
+        E_crit=E_crit,
+        E_aut=E_aut,
+        E_need=E_need,
+        E_bat=E_bat,
+        PR_eff=PR_eff,
+        kWp_raw=kWp_raw,
+        kWp_cap=kWp_cap,
+        kWp=kWp,
+        P_inv=P_inv,
+        E_pv_yr=E_pv_yr,
+        E_load_yr=E_load_yr,
+        E_matched=E_matched,
+        tCO2_yr=tCO2_yr,
+        credits_yr=credits_yr,
+        value_carbon_yr=value_carbon_yr,
+        h_pump=h_pump,
+    )
+
+# Numeric Inputs fields that plan_batch() can sweep; select-style and bool fields stay scalar
+_SWEEPABLE = (
+    "E_bill_month_kwh", "N_day", "N_night", "growth_pct",
+    "W_month_liters", "head_m", "pump_eff", "P_pump_kw", "S_water", "beta_water",
+    "T_water_extra_h_max", "PSH", "PR_base", "shading_pct", "S_elec",
+    "A_roof_m2", "A_ground_m2", "PD_kwp_per_m2", "DC_AC", "DoD", "eta_sys",
+    "EF_grid", "EF_diesel", "p_CO2", "growth_cap",
+)
+
+def plan_batch(i: Inputs, **sweep) -> dict:
+    # Vectorized plan() for scenario sweeps: numeric fields passed as keyword arrays
+    # (e.g. PSH=np.linspace(3, 6, 31)) are broadcast together, everything else comes from i.
+    # Returns a dict of arrays keyed like PlanResult.
+    import numpy as np  # only needed for sweeps; keeps numpy off the server startup path
+
+    unknown = set(sweep) - set(_SWEEPABLE)
+    if unknown:
+        raise ValueError(f"plan_batch cannot sweep: {', '.join(sorted(unknown))}")
+
+    def arr(name):
+        v = sweep[name] if name in sweep else getattr(i, name)
+        return np.asarray(np.nan if v is None else v, dtype=float)  # None -> NaN (bill/head unknown)
+
+    E_bill, head_m = arr("E_bill_month_kwh"), arr("head_m")
+    W, S_water, S_elec = arr("W_month_liters"), arr("S_water"), arr("S_elec")
+
+    # Demand
+    E_site = np.where(E_bill > 0, E_bill / 30.0, 2.8 * arr("N_day") + 1.4 * arr("N_night"))
+    hydraulic = np.maximum(1000.0 * 9.81 * head_m * (W / 30_000.0) / (arr("pump_eff") * 3.6e6), 0.0)
+    proxy = (W / 30_000.0) * 0.45
+    E_pump = np.where(np.isnan(head_m), proxy, hydraulic)
+    E_pump = E_pump * (1.0 + arr("beta_water") * np.maximum(0.0, (S_water - 7) / 3.0))
+    G = np.minimum(1.0 + arr("growth_pct") / 100.0, arr("growth_cap"))
+    E_daily = (E_site + E_pump) * G
+
+    # Critical and autonomy
+    fcrit = critical_fraction(i)
+    E_crit = fcrit * E_daily
+    T_aut = (max(2.0, _OUTAGE_VALS[i._outage_idx] * _TOD_VALS[i._tod_idx])
+             + arr("T_water_extra_h_max") * np.maximum(0.0, (S_water - 7) / 2.0))
+    E_aut = E_daily * (T_aut / 24.0)
+    E_need = np.maximum(E_crit, E_aut)
+    E_bat = E_need / (arr("DoD") * arr("eta_sys"))
+
+    # PV size
+    PSH = arr("PSH")
+    PR_eff = arr("PR_base") * (1.0 - arr("shading_pct") / 100.0)
+    M = np.minimum(dust_margin(i) + severe_margin(i) + 0.02 * (S_elec >= 8) + 0.02 * (S_water >= 8), 0.20)
+    kWp_raw = E_daily / (PSH * PR_eff) * (1.0 + M)
+    kWp_cap = (arr("A_roof_m2") + arr("A_ground_m2")) * arr("PD_kwp_per_m2")
+    kWp = np.minimum(kWp_raw, kWp_cap)
+    P_inv = kWp / arr("DC_AC")
+
+    # Annuals & carbon
+    E_pv_yr = kWp * PSH * PR_eff * _DAYS_PER_YEAR
+    E_load_yr = E_daily * _DAYS_PER_YEAR
+    E_matched = np.minimum(E_pv_yr, E_load_yr)
+    EF = arr("EF_grid") if i.grid_yes else arr("EF_diesel")
+    tCO2_yr = E_matched * EF * 1e-3
+    credits_yr = tCO2_yr
+    value_carbon_yr = credits_yr * arr("p_CO2")
 
     # Convenience hints
-    h_pump = max(0.5, E_pump / max(i.P_pump_kw, 0.1))
+    h_pump = np.maximum(0.5, E_pump / np.maximum(arr("P_pump_kw"), 0.1))
 
-    return {
+    out = {
         "E_site": E_site,
         "E_pump": E_pump,
         "G": G,
@@ -174,3 +343,5 @@ def plan(i: Inputs) -> dict:
         "value_carbon_yr": value_carbon_yr,
         "h_pump": h_pump,
     }
+    shape = np.broadcast_shapes(*(np.shape(v) for v in sweep.values()))
+    return {k: np.broadcast_to(v, shape) for k, v in out.items()}
@@ -1,23 +1,31 @@
 # main.py
 import os
-import json
 from datetime import date
-from jinja2 import Template
+from functools import lru_cache
 from nicegui import ui
-from core import Inputs, plan
-
-# Load HTML template once
-with open('report_template.html', 'r', encoding='utf-8') as f:
-    REPORT_TPL = Template(f.read())
-
-def render_report(inputs: Inputs, results: dict) -> str:
-    return REPORT_TPL.render(
-        today=date.today().isoformat(),
+from core import Inputs, PlanResult, plan
+
+# Load and compile the HTML template on first report download (keeps jinja2 off the startup path)
+@lru_cache(maxsize=1)
+def _template():
+    from jinja2 import BaseLoader, Environment
+    env = Environment(loader=BaseLoader(), auto_reload=False, cache_size=400, optimized=True)
+    with open('report_template.html', 'r', encoding='utf-8') as f:
+        return env.from_string(f.read())
+
+@lru_cache(maxsize=32)
+def _render_cached(today: str, inputs: Inputs, results: PlanResult) -> str:
+    # Inputs and PlanResult are frozen/hashable, so repeat downloads of the same plan hit the cache
+    return _template().render(
+        today=today,
         site_name="Demo Site",
         inputs=inputs,
         results=results,
     )
 
+def render_report(inputs: Inputs, results: PlanResult) -> str:
+    return _render_cached(date.today().isoformat(), inputs, results)
+
 def number(label, value=0.0, step=1.0, minv=None, maxv=None):
     return ui.number(label, value=value, step=step, min=minv, max=maxv).props('outlined dense').classes('w-full')
 
@@ -136,16 +144,23 @@ with ui.tab_panels(tabs, value=t1).classes('w-full'):
                     EF_diesel=float(efd.value or 0.8),
                     p_CO2=float(pco2.value or 6.0),
                 )
+                inputs_dict = data.model_dump()   # once per run, shared by the view and the JSON download
                 results = plan(data)
 
+                import json
+                # read-only view: a static code block is much lighter than a json_editor
+                payload = {'inputs': inputs_dict, 'results': results.as_dict()}
+                payload_str = json.dumps(payload, indent=2)
+                payload_bytes = payload_str.encode('utf-8')  # shared by every JSON download of this run
+
                 result_card.clear()
                 with result_card:
                     ui.label('Results').classes('text-lg font-semibold')
-                    ui.json_editor({'inputs': data.model_dump(), 'results': results}).classes('w-full h-96')
+                    ui.code(payload_str, language='json').classes('w-full h-96')
 
                     def dl_json():
                         ui.download(
-                            data=json.dumps({'inputs': data.model_dump(), 'results': results}, indent=2).encode('utf-8'),
+                            data=payload_bytes,
                             filename='solar_plan.json'
                         )
 